@@ -1,10 +1,25 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import json
+from functools import lru_cache
+import mmap
+import orjson
 import os
-import re
+import pickle
+import sys
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List
 
+try:
+    import ahocorasick  # pyahocorasick, optional C extension
+except ImportError:  # pragma: no cover - exercised only without the extension
+    ahocorasick = None
+
+try:
+    import re2  # google-re2, optional C extension
+except ImportError:  # pragma: no cover - exercised only without the extension
+    re2 = None
+
 from typing_extensions import TypedDict, Annotated
 from langchain_core.messages import BaseMessage, HumanMessage
 from langgraph.graph import StateGraph, END
@@ -14,7 +29,10 @@ from langgraph.graph.message import add_messages
 # FastAPI app
 # ---------------------------------------------------------
 
-app = FastAPI(title="Ticket Triage – LangGraph Workflow")
+app = FastAPI(
+    title="Ticket Triage – LangGraph Workflow",
+    default_response_class=ORJSONResponse,
+)
 
 # ---------------------------------------------------------
 # Data loading helpers
@@ -24,15 +42,172 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 MOCK_DIR = os.path.join(ROOT, "mock_data")
 
 
+def _extract_order_id(text_lower: str) -> Optional[str]:
+    """
+    Find the first order id ("ORD" plus four digits) in already-lowercased
+    text. Equivalent to the old case-insensitive ORD\\d{4} regex, but built
+    on CPython's vectorized str.find plus a four-character digit check, so
+    the regex engine never runs on the hot path.
+    """
+    i = text_lower.find("ord")
+    while i != -1:
+        digits = text_lower[i + 3:i + 7]
+        # isdecimal matches \d's Nd semantics; isdigit would also accept
+        # superscripts and other digit-like characters the regex rejected.
+        if len(digits) == 4 and digits.isdecimal():
+            return "ORD" + digits
+        i = text_lower.find("ord", i + 1)
+    return None
+
+
 def load(name: str):
     """Load a JSON file from the mock_data directory."""
-    with open(os.path.join(MOCK_DIR, name), "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(os.path.join(MOCK_DIR, name), "rb") as f:
+        return orjson.loads(f.read())
+
+
+_MOCK_SOURCES = ("orders.json", "issues.json", "replies.json")
+_MOCK_CACHE_PATH = os.path.join(MOCK_DIR, ".mock_data.pkl")
+
+
+def _load_mock_data():
+    """
+    Load all mock-data files through a pickled cache backed by mmap.
+
+    The first process to import rebuilds mock_data/.mock_data.pkl (pickle
+    protocol 5) from the JSON sources; later imports mmap the file read-only
+    and unpickle from the mapped buffer, skipping JSON parsing on cold start.
+    Unpickling still materializes a per-process object graph — only the
+    file-byte reads go through the shared OS page cache. The cache is rebuilt
+    whenever any source file is at least as new as it; on a read-only
+    filesystem the freshly parsed JSON is used directly.
+    """
+    try:
+        cache_mtime = os.path.getmtime(_MOCK_CACHE_PATH)
+    except OSError:
+        cache_mtime = None
+
+    stale = cache_mtime is None or any(
+        os.path.getmtime(os.path.join(MOCK_DIR, name)) >= cache_mtime
+        for name in _MOCK_SOURCES
+    )
+    if stale:
+        data = tuple(load(name) for name in _MOCK_SOURCES)
+        # Write to a temp file and rename into place so a concurrently
+        # importing worker never maps a half-written cache. If the directory
+        # is not writable, just serve the freshly parsed data uncached.
+        tmp_path = f"{_MOCK_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=5)
+            os.replace(tmp_path, _MOCK_CACHE_PATH)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        return data
+
+    with open(_MOCK_CACHE_PATH, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return pickle.loads(buf)
+        finally:
+            buf.close()
+
+
+_orders_raw, _issues_raw, _replies_raw = _load_mock_data()
+
+# Mock data is read-only after load; freeze each record behind a read-only
+# mapping view so nothing can mutate it between requests.
+ORDERS = tuple(MappingProxyType(o) for o in _orders_raw)
+ISSUES = tuple(MappingProxyType(row) for row in _issues_raw)
+REPLIES = tuple(MappingProxyType(row) for row in _replies_raw)
+
+# ISSUES is static, so lowercase every keyword once instead of per request.
+_ISSUE_KWS = tuple((row["keyword"].lower(), row["issue_type"]) for row in ISSUES)
+
+# Index orders by order_id so fetch_order_node is a hash lookup, not a scan.
+# Keys are interned so equal ids compare by pointer in the hash probe.
+_ORDERS_BY_ID = {sys.intern(o["order_id"]): o for o in ORDERS}
+
+_DEFAULT_TEMPLATE = (
+    "Hi {{customer_name}}, thanks for reaching out about order {{order_id}}. "
+    "Our team is reviewing your request and will follow up shortly."
+)
+
+
+def _compile_template(template: str) -> str:
+    """Rewrite {{placeholder}} markers into str.format fields once, at import,
+    so rendering is a single format_map pass instead of one scan per marker."""
+    return (
+        template
+        .replace("{{customer_name}}", "{customer_name}")
+        .replace("{{order_id}}", "{order_id}")
+    )
+
+
+# REPLIES is static too; index compiled templates by issue_type for O(1) retrieval.
+_REPLY_TEMPLATES = {
+    row["issue_type"]: _compile_template(row["template"]) for row in REPLIES
+}
+_DEFAULT_COMPILED = _compile_template(_DEFAULT_TEMPLATE)
+
 
+def _build_issue_scanner():
+    """
+    Pick the fastest available multi-keyword scanner at import time.
+
+    Preference order:
+      1. Aho-Corasick automaton (pyahocorasick): one linear pass.
+      2. RE2 pattern set (google-re2): all keywords compiled into one
+         automaton, matched in a single linear-time scan.
+      3. Plain per-keyword substring loop.
+
+    Each scanner takes lowercased text and returns an issue_type (or "other"),
+    with ties broken by row order in issues.json.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for index, (keyword, issue_type) in enumerate(_ISSUE_KWS):
+            automaton.add_word(keyword, (index, issue_type))
+        automaton.make_automaton()
+
+        def scan(text_lower: str) -> str:
+            best_index = len(_ISSUE_KWS)
+            issue_type = "other"
+            for _, (index, itype) in automaton.iter(text_lower):
+                if index < best_index:
+                    best_index = index
+                    issue_type = itype
+            return issue_type
+
+        return scan
+
+    if re2 is not None:
+        pattern_set = re2.Set.SearchSet()
+        for keyword, _ in _ISSUE_KWS:
+            pattern_set.Add(re2.escape(keyword))
+        pattern_set.Compile()
+
+        def scan(text_lower: str) -> str:
+            matches = pattern_set.Match(text_lower)
+            if not matches:
+                return "other"
+            return _ISSUE_KWS[min(matches)][1]
+
+        return scan
+
+    def scan(text_lower: str) -> str:
+        for keyword, issue_type in _ISSUE_KWS:
+            if keyword in text_lower:
+                return issue_type
+        return "other"
+
+    return scan
 
-ORDERS = load("orders.json")
-ISSUES = load("issues.json")
-REPLIES = load("replies.json")
+
+_ISSUE_SCANNER = _build_issue_scanner()
 
 
 # ---------------------------------------------------------
@@ -46,6 +221,7 @@ class TriageState(TypedDict, total=False):
     Fields:
       - messages: running conversation / trace (for tools or LLMs later)
       - ticket_text: original ticket text
+      - ticket_text_lower: lowercased ticket text, computed once in ingest
       - order_id: extracted or provided order id
       - issue_type: classified issue type (refund_request, damaged_item, etc.)
       - evidence: short string explaining why we classified that way
@@ -57,6 +233,7 @@ class TriageState(TypedDict, total=False):
     # messages aggregates using add_messages so each node can append
     messages: Annotated[List[BaseMessage], add_messages]
     ticket_text: str
+    ticket_text_lower: Optional[str]
     order_id: Optional[str]
     issue_type: Optional[str]
     evidence: Optional[str]
@@ -69,16 +246,9 @@ class TriageState(TypedDict, total=False):
 # Node helpers (pure business logic)
 # ---------------------------------------------------------
 
-def _classify_issue_text(ticket_text: str) -> Dict[str, str]:
-    """Rule-based classification using issues.json."""
-    text_lower = ticket_text.lower()
-    issue_type = "other"
-
-    for row in ISSUES:
-        keyword = row["keyword"].lower()
-        if keyword in text_lower:
-            issue_type = row["issue_type"]
-            break
+def _classify_issue_text(text_lower: str) -> Dict[str, str]:
+    """Rule-based classification using issues.json. Expects lowercased text."""
+    issue_type = _ISSUE_SCANNER(text_lower)
 
     evidence = f"Matched keyword for issue_type={issue_type}"
 
@@ -99,26 +269,12 @@ def _classify_issue_text(ticket_text: str) -> Dict[str, str]:
 
 def _draft_reply(issue_type: str, order: Dict[str, Any]) -> str:
     """Render a reply template from replies.json with order data."""
-    template = None
-    for row in REPLIES:
-        if row["issue_type"] == issue_type:
-            template = row["template"]
-            break
-
-    if template is None:
-        template = (
-            "Hi {{customer_name}}, thanks for reaching out about order {{order_id}}. "
-            "Our team is reviewing your request and will follow up shortly."
-        )
-
-    customer_name = order.get("customer_name", "there")
-    order_id = order.get("order_id", "")
+    template = _REPLY_TEMPLATES.get(issue_type, _DEFAULT_COMPILED)
 
-    return (
-        template
-        .replace("{{customer_name}}", customer_name)
-        .replace("{{order_id}}", order_id)
-    )
+    return template.format_map({
+        "customer_name": order.get("customer_name", "there"),
+        "order_id": order.get("order_id", ""),
+    })
 
 
 # ---------------------------------------------------------
@@ -138,19 +294,21 @@ def ingest_node(state: TriageState) -> TriageState:
     ticket_text = state["ticket_text"]
     order_id = state.get("order_id")
 
+    # Lowercase once here; classify_issue_node reuses it via state instead of
+    # rescanning and reallocating the string.
+    text_lower = ticket_text.lower()
+
     # Try to extract order_id like ORD1001 from free text if not provided.
     if not order_id:
-        match = re.search(r"(ORD\d{4})", ticket_text, re.IGNORECASE)
-        if match:
-            order_id = match.group(1).upper()
+        order_id = _extract_order_id(text_lower)
 
-    messages = list(state.get("messages", []))
-    messages.append(HumanMessage(content=ticket_text))
-
-    new_state: TriageState = dict(state)
-    new_state["messages"] = messages
-    new_state["order_id"] = order_id
-    return new_state
+    # Only the new message is returned; the add_messages reducer appends it
+    # to the existing history without us copying the list here.
+    return {
+        "messages": [HumanMessage(content=ticket_text)],
+        "ticket_text_lower": text_lower,
+        "order_id": order_id,
+    }
 
 
 def classify_issue_node(state: TriageState) -> TriageState:
@@ -159,12 +317,10 @@ def classify_issue_node(state: TriageState) -> TriageState:
       - Reads ticket_text
       - Sets issue_type, evidence, recommendation
     """
-    ticket_text = state.get("ticket_text") or ""
-    classification = _classify_issue_text(ticket_text)
-
-    new_state: TriageState = dict(state)
-    new_state.update(classification)
-    return new_state
+    text_lower = state.get("ticket_text_lower")
+    if text_lower is None:
+        text_lower = (state.get("ticket_text") or "").lower()
+    return _classify_issue_text(text_lower)
 
 
 def fetch_order_node(state: TriageState) -> TriageState:
@@ -177,14 +333,12 @@ def fetch_order_node(state: TriageState) -> TriageState:
     if not order_id:
         raise ValueError("order_id is required before fetch_order_node")
 
-    order = next((o for o in ORDERS if o["order_id"] == order_id), None)
+    order = _ORDERS_BY_ID.get(order_id)
     if not order:
         # We propagate an error; FastAPI layer will turn this into HTTP.
         raise ValueError(f"order not found for id={order_id}")
 
-    new_state: TriageState = dict(state)
-    new_state["order"] = order
-    return new_state
+    return {"order": order}
 
 
 def draft_reply_node(state: TriageState) -> TriageState:
@@ -199,11 +353,7 @@ def draft_reply_node(state: TriageState) -> TriageState:
     if order is None:
         raise ValueError("order is required before draft_reply_node")
 
-    reply_text = _draft_reply(issue_type, order)
-
-    new_state: TriageState = dict(state)
-    new_state["reply_text"] = reply_text
-    return new_state
+    return {"reply_text": _draft_reply(issue_type, order)}
 
 
 # ---------------------------------------------------------
@@ -236,6 +386,46 @@ def build_triage_graph():
 graph = build_triage_graph()
 
 
+# ---------------------------------------------------------
+# Fused fast path
+# ---------------------------------------------------------
+
+def run_triage(ticket_text: str, order_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the whole triage pipeline as one direct function call.
+
+    The graph is a fixed straight line (ingest -> classify -> fetch -> draft),
+    so the HTTP hot path inlines the four steps and skips LangGraph's per-node
+    dispatch and state merging. The compiled graph stays available for callers
+    who want the state machine. Raises ValueError with the same messages the
+    graph nodes use, so the HTTP error mapping is unchanged.
+    """
+    text_lower = ticket_text.lower()
+
+    if not order_id:
+        order_id = _extract_order_id(text_lower)
+    if not order_id:
+        raise ValueError("order_id is required before fetch_order_node")
+
+    order = _ORDERS_BY_ID.get(order_id)
+    if not order:
+        raise ValueError(f"order not found for id={order_id}")
+
+    classification = _classify_issue_text(text_lower)
+    issue_type = classification["issue_type"]
+
+    return {
+        "order_id": order_id,
+        "issue_type": issue_type,
+        # Plain dict rather than the frozen proxy so the result is directly
+        # orjson-serializable; copied at most once per cached entry.
+        "order": dict(order),
+        "reply_text": _draft_reply(issue_type, order),
+        "evidence": classification["evidence"],
+        "recommendation": classification["recommendation"],
+    }
+
+
 # ---------------------------------------------------------
 # FastAPI models
 # ---------------------------------------------------------
@@ -245,34 +435,48 @@ class TriageInput(BaseModel):
     order_id: Optional[str] = None
 
 
+class TriageBatch(BaseModel):
+    items: List[TriageInput]
+
+
 # ---------------------------------------------------------
-# FastAPI endpoint that invokes the LangGraph
+# FastAPI endpoint that invokes the triage pipeline
 # ---------------------------------------------------------
 
-@app.post("/triage/invoke")
-def triage_invoke(body: TriageInput):
+@lru_cache(maxsize=1024)
+def _triage_cached(ticket_text: str, order_id: Optional[str]) -> Dict[str, Any]:
     """
-    FastAPI entrypoint that delegates to the LangGraph workflow.
+    Run the triage pipeline for (ticket_text, order_id).
+
+    Triage output is a pure function of its inputs plus the static mock data,
+    so identical requests hit the LRU cache instead of re-running the
+    pipeline. Failures raise and are never cached.
 
-    - Initializes TriageState
-    - Runs the compiled graph
-    - Maps graph state to an HTTP JSON response
+    The returned dict (including its nested order record) is shared across
+    cache hits: callers must treat it as frozen and never mutate it.
     """
-    initial_state: TriageState = {
-        "messages": [],
-        "ticket_text": body.ticket_text,
-        "order_id": body.order_id,
-        "issue_type": None,
-        "evidence": None,
-        "recommendation": None,
-        "order": None,
-        "reply_text": None,
-    }
+    return run_triage(ticket_text, order_id)
+
 
+@app.post("/triage/invoke")
+async def triage_invoke(body: TriageInput):
+    """
+    FastAPI entrypoint for the triage pipeline.
+
+    - Runs the (cached) fused triage pipeline
+    - Maps pipeline errors to HTTP responses
+
+    Declared async even though the work is synchronous: it is sub-millisecond
+    CPU work with no blocking I/O, so running it inline beats FastAPI's
+    run_in_threadpool round-trip for plain `def` endpoints.
+
+    Returns an ORJSONResponse built directly from the result dict, skipping
+    FastAPI's jsonable_encoder pass over the payload.
+    """
     try:
-        final_state = graph.invoke(initial_state)
+        return ORJSONResponse(_triage_cached(body.ticket_text, body.order_id))
     except ValueError as e:
-        # Turn node-level errors into HTTP responses
+        # Turn pipeline-level errors into HTTP responses
         message = str(e)
         if "order_id is required" in message:
             raise HTTPException(status_code=400, detail=message)
@@ -280,15 +484,21 @@ def triage_invoke(body: TriageInput):
             raise HTTPException(status_code=404, detail=message)
         raise HTTPException(status_code=500, detail=message)
 
-    if not final_state.get("order"):
-        # Safety net: should not happen if fetch_order_node succeeded
-        raise HTTPException(status_code=500, detail="order missing in final state")
 
-    return {
-        "order_id": final_state.get("order_id"),
-        "issue_type": final_state.get("issue_type"),
-        "order": final_state.get("order"),
-        "reply_text": final_state.get("reply_text"),
-        "evidence": final_state.get("evidence"),
-        "recommendation": final_state.get("recommendation"),
-    }
\ No newline at end of file
+@app.post("/triage/invoke_batch")
+async def triage_invoke_batch(body: TriageBatch):
+    """
+    Batch variant of /triage/invoke.
+
+    Triages every ticket in one request, amortizing HTTP parsing, validation,
+    and response encoding across the batch. Results come back in input order;
+    a ticket that fails triage yields an {"error": ...} entry instead of
+    failing the whole batch.
+    """
+    results = []
+    for item in body.items:
+        try:
+            results.append(_triage_cached(item.ticket_text, item.order_id))
+        except ValueError as e:
+            results.append({"error": str(e)})
+    return ORJSONResponse(results)
\ No newline at end of file
@@ -9,7 +9,8 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.main import app, ingest_node, fetch_order_node
+import app.main as app_main
+from app.main import app, graph, ingest_node, fetch_order_node, run_triage
 
 
 def test_ingest_node_extracts_order_id_and_appends_message():
@@ -33,6 +34,42 @@ def test_fetch_order_node_requires_order_id():
     assert "order_id is required" in str(excinfo.value)
 
 
+@pytest.mark.parametrize(
+    "disabled",
+    [(), ("ahocorasick",), ("ahocorasick", "re2")],
+    ids=["ahocorasick", "re2", "plain-loop"],
+)
+def test_issue_scanner_tiers_agree(monkeypatch, disabled):
+    for name in disabled:
+        monkeypatch.setattr(app_main, name, None)
+
+    scan = app_main._build_issue_scanner()
+
+    assert scan("the parcel has still not arrived") == "late_delivery"
+    # "refund" and "charged twice" both match; row order must break the tie.
+    assert scan("i was charged twice and want a refund") == "refund_request"
+    assert scan("everything is great, thanks") == "other"
+
+
+def test_run_triage_matches_workflow_behavior():
+    ticket_text = "My package is missing from order ORD1003."
+
+    result = run_triage(ticket_text)
+    final_state = graph.invoke({"messages": [], "ticket_text": ticket_text})
+
+    # The fused fast path and the retained LangGraph workflow must agree.
+    assert result["order_id"] == final_state["order_id"]
+    assert result["issue_type"] == final_state["issue_type"]
+    assert result["reply_text"] == final_state["reply_text"]
+    assert result["evidence"] == final_state["evidence"]
+    assert result["recommendation"] == final_state["recommendation"]
+    assert result["order"] == dict(final_state["order"])
+
+    assert result["order_id"] == "ORD1003"
+    assert result["issue_type"] == "missing_item"
+    assert "Sara Patel" in result["reply_text"]
+
+
 def test_triage_invoke_runs_full_workflow():
     client = TestClient(app)
     payload = {
@@ -47,3 +84,25 @@ def test_triage_invoke_runs_full_workflow():
     assert body["issue_type"] == "damaged_item"
     assert "Ava Chen" in body["reply_text"]
     assert "issue_type=damaged_item" in body["evidence"]
+
+
+def test_triage_invoke_batch_preserves_order_and_isolates_errors():
+    client = TestClient(app)
+    payload = {
+        "items": [
+            {"ticket_text": "Order ORD1002 arrived late, please help."},
+            {"ticket_text": "No order id in this ticket at all."},
+            {"ticket_text": "I want a refund for order ORD1004."},
+        ]
+    }
+
+    response = client.post("/triage/invoke_batch", json=payload)
+    assert response.status_code == 200
+
+    results = response.json()
+    assert len(results) == 3
+    assert results[0]["order_id"] == "ORD1002"
+    assert results[0]["issue_type"] == "late_delivery"
+    assert "order_id is required" in results[1]["error"]
+    assert results[2]["order_id"] == "ORD1004"
+    assert results[2]["issue_type"] == "refund_request"